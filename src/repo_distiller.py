@@ -17,15 +17,24 @@ import argparse
 import csv
 import json
 import logging
+import logging.handlers
+import math
+import os
+import queue
 import re
 import shutil
+import stat
 import sys
-from collections import deque
+import threading
+from array import array
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from pathlib import Path, PurePosixPath
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 try:
     import yaml
@@ -33,11 +42,46 @@ except ImportError:
     print("ERROR: PyYAML is required. Install it with: uv add pyyaml", file=sys.stderr)
     sys.exit(1)
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+try:
+    import orjson  # optional: faster JSON serialization for sampled output
+except ImportError:
+    orjson = None
+
 
 # ============================================================================
 # CONFIGURATION & DATA STRUCTURES
 # ============================================================================
 
+# Copy/sample work is I/O-bound, so oversubscribe CPUs like ThreadPoolExecutor's
+# own default does.
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Copy/sample tasks allowed in flight per worker before the walk waits for some
+# to finish, so memory stays bounded on very large trees.
+_PENDING_TASKS_PER_WORKER = 4
+
+# Log records buffered in memory before being written to the log file; records
+# at ERROR and above flush the buffer immediately.
+_LOG_BUFFER_RECORDS = 4096
+
+# Read size for chunked byte scans, and initial window for reading file tails.
+_SCAN_CHUNK_BYTES = 1 << 20
+_TAIL_BLOCK_BYTES = 1 << 16
+
+# JSON files above this size are sampled by streaming array items instead of
+# parsing the whole document in memory.
+_JSON_STREAM_THRESHOLD_BYTES = 8 << 20
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+_JSON_NUMBER_CHARS = re.compile(r'[0-9.eE+-]*')
+
+# Eight-digit runs not embedded in a longer number, checked for a YYYYMMDD date.
+_YYYYMMDD_RE = re.compile(r"(?<!\d)(\d{8})(?!\d)")
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
 class FilterAction(Enum):
     """Enumeration of possible actions for a file."""
     COPY = "COPY"
@@ -45,7 +89,11 @@ class FilterAction(Enum):
     SKIP = "SKIP"
 
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__.
+_DATACLASS_SLOTS: Dict[str, bool] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class FilterStats:
     """Statistics tracking for the distillation process."""
     scanned: int = 0
@@ -53,14 +101,66 @@ class FilterStats:
     sampled: int = 0
     skipped: int = 0
     errors: int = 0
-    skipped_reasons: Dict[str, int] = field(default_factory=dict)
+    pruned_dirs: int = 0
+    skipped_reasons: Counter = field(default_factory=Counter)
 
     def add_skip_reason(self, reason: str) -> None:
         """Track skip reasons for summary reporting."""
-        self.skipped_reasons[reason] = self.skipped_reasons.get(reason, 0) + 1
+        self.skipped_reasons[reason] += 1
+
 
+def _config_cache_path(config_path: Path) -> Path:
+    """Sidecar file holding the parsed YAML as JSON, e.g. config.yaml.cache.json."""
+    return config_path.with_name(config_path.name + '.cache.json')
 
-@dataclass
+
+def _load_config_data(config_path: Path) -> dict:
+    """
+    Parse a YAML config, reusing a JSON sidecar cache when it is current.
+
+    The sidecar records the YAML file's mtime_ns and size; on a match the cached
+    data is loaded with the (much faster) json parser. Data that does not
+    survive a JSON round trip unchanged (dates, non-string keys, ...) is never
+    cached, and cache read/write failures fall back to parsing the YAML.
+    """
+    st = config_path.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    cache_path = _config_cache_path(config_path)
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and cached.get('_stamp') == stamp:
+            return cached['data']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = yaml.load(f, Loader=_YAML_LOADER) or {}
+
+    try:
+        payload = json.dumps({'_stamp': stamp, 'data': config_data})
+        cacheable = json.loads(payload)['data'] == config_data
+    except (TypeError, ValueError):
+        cacheable = False
+
+    if cacheable:
+        # Write to a temp file and rename so concurrent runs never see a partial cache
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    return config_data
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class DistillerConfig:
     """Configuration container for the distiller."""
     max_file_size_mb: float
@@ -70,80 +170,124 @@ class DistillerConfig:
     blacklist_extensions: List[str]
     blacklist_patterns: List[re.Pattern]
     blacklist_directories: List[str]
-    blacklist_filename_substrings: List[str]
-    blacklist_datetime_stamp_yyyymmdd: bool
     data_sampling_enabled: bool
     data_sampling_extensions: Set[str]
     data_sampling_include_header: bool
     data_sampling_head_rows: int
     data_sampling_tail_rows: int
+    blacklist_filename_substrings: List[str] = field(default_factory=list)
+    blacklist_datetime_stamp_yyyymmdd: bool = True
     ai_coding_env: str = 'chat'
 
-    
-@staticmethod
-def from_yaml(config_path: Path) -> 'DistillerConfig':
-    """Load and parse configuration from YAML file."""
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in config file: {e}")
-
-    blacklist_cfg = config_data.get('blacklist', {}) or {}
-    whitelist_cfg = config_data.get('whitelist', {}) or {}
-    sampling_cfg = config_data.get('data_sampling', {}) or {}
-
-    # Parse and compile regex patterns (filename-only)
-    patterns: List[re.Pattern] = []
-    for pattern_str in blacklist_cfg.get('patterns', []) or []:
+    @staticmethod
+    def from_yaml(config_path: Path) -> 'DistillerConfig':
+        """Load and parse configuration from YAML file."""
         try:
-            patterns.append(re.compile(pattern_str))
-        except re.error as e:
-            logging.warning(f"Invalid regex pattern '{pattern_str}': {e}")
-
-    # Filename substring blacklist (case-insensitive contains checks)
-    filename_substrings = blacklist_cfg.get('filename_substrings', []) or []
-    if not isinstance(filename_substrings, list):
-        filename_substrings = []
-
-    # Datetime-stamp blacklist flag (YYYYMMDD in filename)
-    datetime_stamp_yyyymmdd = blacklist_cfg.get('datetime_stamp_yyyymmdd', True)
-    if not isinstance(datetime_stamp_yyyymmdd, bool):
-        datetime_stamp_yyyymmdd = True
-
-    # Normalize extensions (ensure leading dot)
-    extensions = blacklist_cfg.get('extensions', []) or []
-    normalized_exts = [ext if str(ext).startswith('.') else f'.{ext}' for ext in extensions]
-
-    # Parse data sampling config
-    sampling_exts = sampling_cfg.get('target_extensions', []) or []
-    normalized_sampling_exts = {ext if str(ext).startswith('.') else f'.{ext}' for ext in sampling_exts}
-
-    return DistillerConfig(
-        max_file_size_mb=float(config_data.get('max_file_size_mb', 5.0)),
-        whitelist_files=whitelist_cfg.get('files', []) or [],
-        whitelist_directories=whitelist_cfg.get('directories', []) or [],
-        blacklist_files=blacklist_cfg.get('files', []) or [],
-        blacklist_extensions=normalized_exts,
-        blacklist_patterns=patterns,
-        blacklist_directories=blacklist_cfg.get('directories', []) or [],
-        blacklist_filename_substrings=filename_substrings,
-        blacklist_datetime_stamp_yyyymmdd=datetime_stamp_yyyymmdd,
-        data_sampling_enabled=bool(sampling_cfg.get('enabled', True)),
-        data_sampling_extensions=normalized_sampling_exts,
-        data_sampling_include_header=bool(sampling_cfg.get('include_header', True)),
-        data_sampling_head_rows=int(sampling_cfg.get('head_rows', 5)),
-        data_sampling_tail_rows=int(sampling_cfg.get('tail_rows', 5)),
-        ai_coding_env=str(config_data.get('ai_coding_env', 'chat'))
-    )
+            config_data = _load_config_data(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in config file: {e}")
+
+        blacklist_cfg = config_data.get('blacklist', {}) or {}
+        whitelist_cfg = config_data.get('whitelist', {}) or {}
+        sampling_cfg = config_data.get('data_sampling', {}) or {}
+
+        # Parse and compile regex patterns (filename-only)
+        patterns: List[re.Pattern] = []
+        for pattern_str in blacklist_cfg.get('patterns', []) or []:
+            try:
+                patterns.append(re.compile(pattern_str))
+            except re.error as e:
+                logging.warning(f"Invalid regex pattern '{pattern_str}': {e}")
+
+        # Filename substring blacklist (case-insensitive contains checks)
+        filename_substrings = blacklist_cfg.get('filename_substrings', []) or []
+        if not isinstance(filename_substrings, list):
+            filename_substrings = []
+
+        # Datetime-stamp blacklist flag (YYYYMMDD in filename)
+        datetime_stamp_yyyymmdd = blacklist_cfg.get('datetime_stamp_yyyymmdd', True)
+        if not isinstance(datetime_stamp_yyyymmdd, bool):
+            datetime_stamp_yyyymmdd = True
+
+        # Normalize extensions (ensure leading dot)
+        extensions = blacklist_cfg.get('extensions', []) or []
+        normalized_exts = [ext if str(ext).startswith('.') else f'.{ext}' for ext in extensions]
+
+        # Parse data sampling config
+        sampling_exts = sampling_cfg.get('target_extensions', []) or []
+        normalized_sampling_exts = {ext if str(ext).startswith('.') else f'.{ext}' for ext in sampling_exts}
+
+        return DistillerConfig(
+            max_file_size_mb=float(config_data.get('max_file_size_mb', 5.0)),
+            whitelist_files=whitelist_cfg.get('files', []) or [],
+            whitelist_directories=whitelist_cfg.get('directories', []) or [],
+            blacklist_files=blacklist_cfg.get('files', []) or [],
+            blacklist_extensions=normalized_exts,
+            blacklist_patterns=patterns,
+            blacklist_directories=blacklist_cfg.get('directories', []) or [],
+            blacklist_filename_substrings=filename_substrings,
+            blacklist_datetime_stamp_yyyymmdd=datetime_stamp_yyyymmdd,
+            data_sampling_enabled=bool(sampling_cfg.get('enabled', True)),
+            data_sampling_extensions=normalized_sampling_exts,
+            data_sampling_include_header=bool(sampling_cfg.get('include_header', True)),
+            data_sampling_head_rows=int(sampling_cfg.get('head_rows', 5)),
+            data_sampling_tail_rows=int(sampling_cfg.get('tail_rows', 5)),
+            ai_coding_env=str(config_data.get('ai_coding_env', 'chat'))
+        )
 
 
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
 
+class _BackgroundFileHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a file handler that runs on a background thread.
+
+    A QueueListener takes records off the queue and buffers them in a
+    MemoryHandler in front of file_handler, so callers only pay for a queue
+    put and the file is written in batches. flush() waits for the queue to
+    drain and writes out the buffer; close() stops the listener thread and
+    closes the file. logging.shutdown() calls both at exit.
+    """
+
+    def __init__(self, file_handler: logging.Handler):
+        # Batch file writes: one write per _LOG_BUFFER_RECORDS records instead of
+        # one per record. Flushed on ERROR, by flush() and on close. Created
+        # before this handler registers itself, because logging.shutdown()
+        # closes handlers newest first and this one must drain into it.
+        self.file_handler = file_handler
+        self.buffer_handler = logging.handlers.MemoryHandler(
+            capacity=_LOG_BUFFER_RECORDS,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+        )
+        super().__init__(queue.Queue(-1))
+        self.listener = logging.handlers.QueueListener(self.queue, self.buffer_handler)
+        self.listener.start()
+        self._listening = True
+
+    def flush(self) -> None:
+        if self._listening:
+            # The listener marks each record done once the buffer handler has it
+            self.queue.join()
+        self.buffer_handler.flush()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._listening:
+                self._listening = False
+                self.listener.stop()
+            self.buffer_handler.close()
+            self.file_handler.close()
+        finally:
+            self.release()
+        super().close()
+
+
 def setup_logging(log_dir: Path, verbose: bool = False) -> logging.Logger:
     """Configure logging with both console and file handlers."""
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -153,8 +297,11 @@ def setup_logging(log_dir: Path, verbose: bool = False) -> logging.Logger:
     logger = logging.getLogger('repo_distiller')
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    # Remove existing handlers to avoid duplicates; closing them also stops the
+    # background thread of an earlier file handler.
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
 
     # Console handler - concise format
     console_handler = logging.StreamHandler(sys.stdout)
@@ -169,13 +316,330 @@ def setup_logging(log_dir: Path, verbose: bool = False) -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     ))
 
+    # Format and write file records on a background thread so the walk and the
+    # copy workers only pay for a queue put. The console stays synchronous to
+    # keep its output ordered with the overwrite prompt.
+    background_file_handler = _BackgroundFileHandler(file_handler)
+    background_file_handler.setLevel(logging.DEBUG)
+
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(background_file_handler)
 
     logger.info(f"Logging initialized. Log file: {log_file}")
     return logger
 
 
+# ============================================================================
+# PATTERN MATCHING
+# ============================================================================
+
+def _normalize_pattern(pattern: str) -> str:
+    """Normalize config patterns to forward-slash, no leading ./"""
+    p = (pattern or "").strip().replace('\\', '/')
+    while p.startswith('./'):
+        p = p[2:]
+    return p
+
+
+def _suffix_lower(name: str) -> str:
+    """Lower-cased extension of a filename, with the same rules as PurePath.suffix."""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ''
+
+
+def _has_wildcards(pattern: str) -> bool:
+    return any(ch in pattern for ch in ['*', '?', '['])
+
+
+@dataclass(frozen=True)
+class _PatternSpec:
+    """A config glob pattern, normalized once when the rules are compiled."""
+    raw: str
+    normalized: str          # forward slashes, no leading "./", no trailing "/"
+    parts: Tuple[str, ...]   # non-empty segments, "." removed
+    has_glob: bool
+
+
+def _parse_patterns(patterns: List[str]) -> List[_PatternSpec]:
+    """Normalize raw config patterns into specs, dropping empty entries."""
+    specs: List[_PatternSpec] = []
+    for raw in patterns or []:
+        pat = _normalize_pattern(raw).rstrip('/')
+        if not pat:
+            continue
+        parts = tuple(seg for seg in pat.split('/') if seg and seg != '.')
+        specs.append(_PatternSpec(raw=raw, normalized=pat, parts=parts, has_glob=_has_wildcards(pat)))
+    return specs
+
+
+def _translate_glob_segment(segment: str) -> str:
+    """Translate one fnmatch-style path segment into a regex that never crosses '/'."""
+    res: List[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            if not res or res[-1] != '[^/]*':
+                res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and segment[j] == '!':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            while j < n and segment[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+                continue
+            stuff = segment[i:j].replace('\\', '\\\\')
+            i = j + 1
+            if stuff.startswith('!'):
+                res.append(f'[^/{stuff[1:]}]')
+            else:
+                if stuff.startswith('^'):
+                    stuff = '\\' + stuff
+                res.append(f'(?!/)[{stuff}]')
+        else:
+            res.append(re.escape(c))
+    return ''.join(res)
+
+
+@lru_cache(maxsize=4096)
+def _translate_glob(parts: Tuple[str, ...]) -> str:
+    """
+    Translate relative glob segments into a right-anchored regex over a POSIX path.
+
+    Mirrors PurePosixPath.match: the pattern's segments must fnmatch the last
+    segments of the path, so "*.py" matches "a/b/c.py".
+    """
+    return '(?:^|/)' + '/'.join(_translate_glob_segment(seg) for seg in parts)
+
+
+class _GlobSet:
+    """
+    Compiled matcher for one list of repo-relative file or directory patterns.
+
+    All patterns are fused into a single regex at construction time so that each
+    path is checked with one regex scan instead of one PurePosixPath.match per
+    pattern. Semantics follow the original per-pattern rules:
+
+      - file patterns: exact string match, or glob via PurePosixPath.match
+      - directory patterns: prefix match for literals; for globs, the path or
+        its parent directory must match
+
+    For directory sets, match_file() splits the decision into a part that only
+    depends on the parent directory (memoized) and a cheap per-file part.
+
+    For file sets, literal paths are kept in a frozenset (one hash lookup), and
+    single-segment globs (e.g. "*.md", ".env.*") can only ever match the final
+    path segment, so they are kept in a separate regex that is matched against
+    the filename alone.
+    """
+
+    def __init__(self, patterns: List[str], directory: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        alternatives: List[str] = []
+        name_alternatives: List[str] = []
+        parent_alternatives: List[str] = []
+        self_alternatives: List[str] = []
+        exact: Set[str] = set()
+        self.specs = _parse_patterns(patterns)
+        for spec in self.specs:
+            pat = spec.normalized
+
+            if not spec.has_glob:
+                if directory:
+                    alternatives.append('^' + re.escape(pat) + '(?:/|$)')
+                    parent_alternatives.append('^' + re.escape(pat) + '(?:/|$)')
+                    self_alternatives.append('^' + re.escape(pat) + '$')
+                else:
+                    exact.add(pat)
+                continue
+
+            # Absolute globs can never match a relative path.
+            if pat.startswith('/'):
+                continue
+
+            base = _translate_glob(spec.parts)
+            regex = base + ('(?:/[^/]*)?$' if directory else '$')
+            try:
+                re.compile(regex)
+            except re.error as e:
+                if logger is not None:
+                    logger.warning(f"Invalid glob pattern '{spec.raw}': {e}")
+                continue
+
+            if not directory:
+                if len(spec.parts) == 1:
+                    name_alternatives.append(_translate_glob_segment(spec.parts[0]))
+                else:
+                    alternatives.append(regex)
+                continue
+
+            alternatives.append(regex)
+            parent_alternatives.append(base + '$')
+            self_alternatives.append(base + '$')
+
+        self._exact = frozenset(exact)
+        self._regex = self._compile(alternatives)
+        self._name_regex = self._compile(name_alternatives)
+        self._parent_regex = self._compile(parent_alternatives)
+        self._self_regex = self._compile(self_alternatives)
+        self._parent_cache: Dict[str, bool] = {}
+
+    @staticmethod
+    def _compile(alternatives: List[str]) -> Optional[re.Pattern]:
+        return re.compile('|'.join(f'(?:{alt})' for alt in alternatives)) if alternatives else None
+
+    def match(self, rel_posix: str, name: Optional[str] = None) -> bool:
+        """Return True if rel_posix (whose final segment is name) matches any pattern."""
+        if rel_posix in self._exact:
+            return True
+        if self._name_regex is not None:
+            if name is None:
+                name = rel_posix.rpartition('/')[2]
+            if self._name_regex.fullmatch(name):
+                return True
+        return self._regex is not None and self._regex.search(rel_posix) is not None
+
+    def clear_cache(self) -> None:
+        """Forget memoized parent-directory results (e.g. between runs over different trees)."""
+        self._parent_cache.clear()
+
+    def match_file(self, rel_posix: str) -> bool:
+        """Directory sets: same result as match(), memoizing the parent-directory part."""
+        parent = rel_posix.rpartition('/')[0]
+        hit = self._parent_cache.get(parent)
+        if hit is None:
+            hit = bool(parent) and self._parent_regex is not None and self._parent_regex.search(parent) is not None
+            self._parent_cache[parent] = hit
+        return hit or (self._self_regex is not None and self._self_regex.search(rel_posix) is not None)
+
+
+# ============================================================================
+# FILE COPY
+# ============================================================================
+
+# In-kernel copy primitives, tried in order on Linux. copy_file_range (3.8+,
+# Linux 4.5+) also lets filesystems share extents (reflink) or copy server-side;
+# sendfile (Linux 2.6.33+) can target a regular file. Both keep file data out of
+# Python buffers.
+_IS_LINUX = sys.platform.startswith('linux')
+_HAS_COPY_FILE_RANGE = _IS_LINUX and hasattr(os, 'copy_file_range')
+_HAS_SENDFILE = _IS_LINUX and hasattr(os, 'sendfile')
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')
+
+
+def _advise_sequential(fd: int) -> None:
+    """Hint that fd will be read front to back, so the kernel reads ahead further."""
+    if _HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _copy_in_kernel(in_fd: int, out_fd: int, size: int) -> int:
+    """
+    Copy up to size bytes from the start of in_fd to out_fd without leaving the
+    kernel. Returns the number of bytes copied, which is short if neither
+    primitive is available or both fail (e.g. EXDEV, ENOSYS, EINVAL); both fds
+    are then positioned at that offset.
+    """
+    offset = 0
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            while offset < size:
+                copied = os.copy_file_range(in_fd, out_fd, size - offset)
+                if copied == 0:
+                    break
+                offset += copied
+            return offset
+        except OSError:
+            pass
+    if _HAS_SENDFILE:
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            pass
+    return offset
+
+
+def _fast_copy(source: Path, destination: Path) -> None:
+    """
+    Copy file contents plus permission bits and timestamps.
+
+    On Linux the bytes are moved in-kernel (copy_file_range, then sendfile), any
+    remainder is finished in userspace, and metadata is restored on the open
+    descriptor from the single fstat() of the source, skipping the extra
+    stat/xattr round trips of shutil.copy2. Other platforms use shutil.copy2.
+    """
+    if not _IS_LINUX:
+        shutil.copy2(source, destination)
+        return
+
+    with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        st = os.fstat(in_fd)
+        _advise_sequential(in_fd)
+        offset = _copy_in_kernel(in_fd, out_fd, st.st_size)
+
+        # Fallback for unsupported filesystems, and for files that grew or report
+        # st_size 0 (e.g. procfs): read whatever is left up to EOF.
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        shutil.copyfileobj(fsrc, fdst)
+        fdst.flush()
+
+        os.fchmod(out_fd, stat.S_IMODE(st.st_mode))
+        os.utime(out_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+# ============================================================================
+# JSON SERIALIZATION
+# ============================================================================
+
+def _has_non_finite_float(obj) -> bool:
+    """True if obj (parsed JSON: dicts, lists and scalars) holds NaN or +/-Infinity."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
+def _json_dumps_bytes(obj) -> bytes:
+    """
+    Serialize obj as 2-space indented UTF-8 JSON.
+
+    Uses orjson when installed; falls back to the stdlib for values orjson
+    rejects (e.g. integers wider than 64 bits) and for NaN/Infinity, which
+    orjson would silently write as null.
+    """
+    if orjson is not None and not _has_non_finite_float(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 # ============================================================================
 # CORE FILTERING LOGIC
 # ============================================================================
@@ -183,10 +647,81 @@ def setup_logging(log_dir: Path, verbose: bool = False) -> logging.Logger:
 class RepositoryDistiller:
     """Main class for repository distillation operations."""
 
-    def __init__(self, config: DistillerConfig, logger: logging.Logger):
+    def __init__(self, config: DistillerConfig, logger: logging.Logger,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         self.config = config
         self.logger = logger
         self.stats = FilterStats()
+        self.max_workers = max(1, int(max_workers))
+        # process_file runs on worker threads; guards FilterStats counters.
+        self._stats_lock = threading.Lock()
+        # Resolved source root of the current distill() run, for log paths.
+        self._source_root: Optional[Path] = None
+        # Destination directories already created during this run.
+        self._created_dirs: Set[Path] = set()
+        # Cached logger.isEnabledFor(DEBUG) for per-file debug lines; refreshed per run
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        # determine_action() callers usually pass the same base path every time
+        self._resolved_bases: Dict[Path, Path] = {}
+
+        # Compile glob rule lists once; they are evaluated for every file.
+        self._whitelist_files = _GlobSet(config.whitelist_files, logger=logger)
+        self._whitelist_dirs = _GlobSet(config.whitelist_directories, directory=True, logger=logger)
+        self._blacklist_files = _GlobSet(config.blacklist_files, logger=logger)
+        self._blacklist_dirs = _GlobSet(config.blacklist_directories, directory=True, logger=logger)
+        self._max_file_size_bytes = config.max_file_size_mb * 1024 * 1024
+        # Lower-cased here once, to match the per-file _suffix_lower() lookups
+        self._blacklist_extensions = frozenset(sys.intern(ext.lower()) for ext in config.blacklist_extensions)
+        self._sampling_extensions = frozenset(sys.intern(ext.lower()) for ext in config.data_sampling_extensions)
+
+        # SAMPLE dispatch by lower-cased extension
+        self._samplers: Dict[str, Callable[[Path, Path], bool]] = {
+            '.csv': partial(self._sample_delimited_file, delimiter=','),
+            '.tsv': partial(self._sample_delimited_file, delimiter='\t'),
+            '.json': self._sample_json_file,
+            '.jsonl': self._sample_json_file,
+        }
+        self._blacklist_pattern_union = self._fuse_patterns(config.blacklist_patterns)
+
+        # Tier 2c: (configured value, upper-cased needle) pairs in list order, and
+        # one alternation over all needles that rejects most filenames in one scan.
+        self._substring_needles: List[Tuple[str, str]] = [
+            (raw, raw.strip().upper())
+            for raw in (config.blacklist_filename_substrings or [])
+            if isinstance(raw, str) and raw.strip()
+        ]
+        self._substring_union: Optional[re.Pattern] = (
+            re.compile('|'.join(re.escape(needle) for _, needle in self._substring_needles))
+            if self._substring_needles else None
+        )
+        self._substring_min_len = min((len(needle) for _, needle in self._substring_needles), default=0)
+
+        # Directory pruning inputs, derived from the already-normalized specs.
+        # Literal entries are kept in sets and matched by looking up each
+        # ancestor of a directory, so the cost follows path depth, not rule count.
+        self._prune_dir_literals = frozenset(
+            spec.normalized for spec in self._blacklist_dirs.specs if not spec.has_glob
+        )
+        # Every ancestor directory of a literal whitelist.files entry, so the
+        # "could anything below be whitelisted?" check is a single set lookup.
+        self._whitelist_file_ancestors = frozenset(
+            '/'.join(spec.parts[:i])
+            for spec in self._whitelist_files.specs if not spec.has_glob
+            for i in range(1, len(spec.parts))
+        )
+        self._whitelist_has_globs = any(spec.has_glob for spec in self._whitelist_files.specs)
+
+        # Tier 3 scope: literal whitelist.directories entries and all of their
+        # ancestors, so subtrees that can never be in scope are not descended into.
+        self._scope_literals = frozenset(
+            spec.normalized for spec in self._whitelist_dirs.specs if not spec.has_glob
+        )
+        self._scope_ancestors = frozenset(
+            '/'.join(spec.parts[:i])
+            for spec in self._whitelist_dirs.specs if not spec.has_glob
+            for i in range(1, len(spec.parts))
+        )
+        self._scope_has_globs = any(spec.has_glob for spec in self._whitelist_dirs.specs)
 
     # -------------------------
     # Path / pattern utilities
@@ -194,9 +729,10 @@ class RepositoryDistiller:
 
     @staticmethod
     def _to_rel_posix(path: Path, base_path: Path) -> Optional[str]:
-        """Return a POSIX-style relative path string, or None if not relative."""
-        path = path.resolve()
-        base_path = base_path.resolve()
+        """Return a POSIX-style relative path string, or None if not relative.
+
+        Both paths must already be resolved.
+        """
         try:
             rel = path.relative_to(base_path)
         except ValueError:
@@ -204,64 +740,102 @@ class RepositoryDistiller:
         return rel.as_posix()
 
     @staticmethod
-    def _normalize_pattern(pattern: str) -> str:
-        """Normalize config patterns to forward-slash, no leading ./"""
-        p = (pattern or "").strip().replace('\\', '/')
-        while p.startswith('./'):
-            p = p[2:]
-        return p
+    def _fuse_patterns(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+        """
+        Combine filename regexes into one alternation, or return None when that
+        would not be equivalent (capturing groups/backreferences, non-default flags).
 
-    @staticmethod
-    def _has_wildcards(pattern: str) -> bool:
-        return any(ch in pattern for ch in ['*', '?', '['])
-
-    def _match_file_patterns(self, rel_posix: str, patterns: List[str]) -> bool:
-        """Match file patterns (exact or glob) against a relative posix path."""
-        rel_path = PurePosixPath(rel_posix)
-        for raw in patterns:
-            pat = self._normalize_pattern(raw)
-            pat = pat.rstrip('/')  # file patterns should not rely on trailing slash
-            if not pat:
-                continue
+        Each pattern is wrapped in its own capturing group, so match.lastindex is
+        the 1-based list position of the pattern that produced the leftmost
+        match. That is not necessarily the first listed pattern that matches
+        somewhere: callers must still re-check the patterns listed before it.
+        """
+        if not patterns:
+            return None
+        default_flags = re.compile('').flags
+        if any(not isinstance(p.pattern, str) or p.groups or p.flags != default_flags for p in patterns):
+            return None
+        try:
+            return re.compile('|'.join(f'({p.pattern})' for p in patterns))
+        except re.error:
+            return None
 
-            # Exact match
-            if not self._has_wildcards(pat) and rel_posix == pat:
+    @staticmethod
+    def _is_at_or_under(rel_dir: str, literals: FrozenSet[str]) -> bool:
+        """True if rel_dir or one of its ancestor directories is in literals."""
+        end = len(rel_dir)
+        while end > 0:
+            if rel_dir[:end] in literals:
                 return True
-
-            # Glob match
-            if self._has_wildcards(pat):
-                try:
-                    if rel_path.match(pat):
-                        return True
-                except Exception as e:
-                    self.logger.warning(f"Invalid glob pattern '{raw}': {e}")
+            end = rel_dir.rfind('/', 0, end)
         return False
 
-    def _match_dir_patterns(self, rel_posix: str, patterns: List[str]) -> bool:
-        """Match directory patterns by prefix semantics and optional glob."""
-        rel_path = PurePosixPath(rel_posix)
-        for raw in patterns:
-            pat = self._normalize_pattern(raw)
-            if not pat:
-                continue
+    def _is_blacklisted_dir_subtree(self, rel_dir: str) -> bool:
+        """True if rel_dir sits under a literal (non-glob) blacklist.directories entry.
 
-            pat = pat.rstrip('/')
+        Glob directory patterns only veto a directory's direct children, so they
+        cannot be used to prune an entire subtree.
+        """
+        return self._is_at_or_under(rel_dir, self._prune_dir_literals)
 
-            # Non-glob directory pattern: prefix match
-            if not self._has_wildcards(pat):
-                if rel_posix == pat or rel_posix.startswith(pat + '/'):
-                    return True
-                continue
+    def _may_contain_whitelisted_file(self, rel_dir: str) -> bool:
+        """True if a Tier 1 whitelist.files entry could match a file below rel_dir."""
+        # Glob patterns match right-anchored, so they may match at any depth.
+        if self._whitelist_has_globs:
+            return True
+        return rel_dir in self._whitelist_file_ancestors
+
+    def _is_outside_whitelist_scope(self, rel_dir: str) -> bool:
+        """True if no file below rel_dir can pass the Tier 3 whitelist.directories gate.
+
+        Only decidable when every entry is a literal: a glob may match at any depth.
+        """
+        if self._scope_has_globs or rel_dir in self._scope_ancestors:
+            return False
+        return not self._is_at_or_under(rel_dir, self._scope_literals)
 
-            # Glob directory pattern:
-            # - direct match (covers patterns like "src/**")
-            # - prefix match by appending "/**"
+    def _can_prune_dir(self, rel_dir: str) -> Optional[str]:
+        """Return the skip reason if every file below rel_dir is guaranteed to be skipped."""
+        if self._may_contain_whitelisted_file(rel_dir):
+            return None
+        if self._is_outside_whitelist_scope(rel_dir):
+            return "tier3_not_in_whitelist_scope"
+        if self._is_blacklisted_dir_subtree(rel_dir):
+            return "tier4_blacklist_directory"
+        return None
+
+    def _iter_files(self, source_dir: Path) -> Iterator[Tuple[os.DirEntry, str, os.stat_result]]:
+        """
+        Breadth-first walk of source_dir yielding (DirEntry, rel_posix, stat) for files.
+
+        Uses os.scandir so file/directory checks come from the cached d_type, and
+        prunes blacklisted directories before descending into them. Each file is
+        stat'd exactly once here (following symlinks, like the copy will).
+        """
+        pending_dirs = deque([(str(source_dir), '')])
+        while pending_dirs:
+            dir_path, rel_dir = pending_dirs.popleft()
             try:
-                if rel_path.match(pat) or rel_path.match(pat + '/**'):
-                    return True
-            except Exception as e:
-                self.logger.warning(f"Invalid glob pattern '{raw}': {e}")
-        return False
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        rel_posix = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            prune_reason = self._can_prune_dir(rel_posix)
+                            if prune_reason:
+                                self.stats.pruned_dirs += 1
+                                if self._debug:
+                                    self.logger.debug("PRUNE[%s]: %s/", prune_reason, rel_posix)
+                                continue
+                            pending_dirs.append((entry.path, rel_posix))
+                        elif entry.is_file():
+                            try:
+                                st = entry.stat()
+                            except OSError as e:
+                                self.logger.warning(f"Cannot stat file {entry.path}: {e}")
+                                continue
+                            yield entry, rel_posix, st
+            except OSError as e:
+                self.logger.warning(f"Cannot scan directory {dir_path}: {e}")
 
     # -------------------------
     # Sampling decision helpers
@@ -272,45 +846,57 @@ class RepositoryDistiller:
         if not self.config.blacklist_datetime_stamp_yyyymmdd:
             return None
 
-        for m in re.finditer(r"(?<!\d)(\d{8})(?!\d)", filename):
+        for m in _YYYYMMDD_RE.finditer(filename):
             candidate = m.group(1)
-            try:
-                datetime.strptime(candidate, "%Y%m%d")
-                return candidate
-            except Exception:
+            if not candidate.isascii():
+                # Non-ASCII digits: leave strptime's own digit rules in charge.
+                try:
+                    datetime.strptime(candidate, "%Y%m%d")
+                    return candidate
+                except ValueError:
+                    continue
+            # Same dates datetime.strptime(candidate, "%Y%m%d") accepts, without
+            # building a datetime per filename.
+            year, month, day = int(candidate[:4]), int(candidate[4:6]), int(candidate[6:])
+            if year < 1 or not 1 <= month <= 12 or day < 1:
                 continue
+            leap_day = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            if day <= _DAYS_IN_MONTH[month] + leap_day:
+                return candidate
         return None
 
     def _filename_contains_blacklisted_substring(self, filename: str) -> Optional[str]:
         """Return the configured substring that matched (case-insensitive), else None."""
-        substrings = self.config.blacklist_filename_substrings or []
-        if not substrings:
+        if self._substring_union is None:
+            return None
+        # An ASCII filename shorter than every needle cannot contain one: skip the
+        # upper-casing and the regex scan. (Non-ASCII names can grow when
+        # upper-cased, e.g. 'ß' -> 'SS', so they always take the full check.)
+        if len(filename) < self._substring_min_len and filename.isascii():
             return None
-
         haystack = filename.upper()
-        for raw in substrings:
-            if not isinstance(raw, str):
-                continue
-            needle = raw.strip().upper()
-            if not needle:
-                continue
+        if not self._substring_union.search(haystack):
+            return None
+        for raw, needle in self._substring_needles:
             if needle in haystack:
                 return raw
         return None
 
-    def _should_sample_data_file(self, path: Path) -> bool:
-        if not self.config.data_sampling_enabled:
-            return False
-        if not path.is_file():
-            return False
-        return path.suffix.lower() in self.config.data_sampling_extensions
+    def _should_sample_data_file(self, ext: str) -> bool:
+        """True if sampling is enabled for this lower-cased extension (regular files only; caller checks)."""
+        return self.config.data_sampling_enabled and ext in self._sampling_extensions
 
     # -------------------------
     # Priority Cascade decision
 
         # -------------------------
 
-    def determine_action(self, path: Path, base_path: Path) -> Tuple[FilterAction, Optional[str]]:
+    def determine_action(
+        self,
+        path: Path,
+        base_path: Path,
+        st: Optional[os.stat_result] = None,
+    ) -> Tuple[FilterAction, Optional[str]]:
         """
         Determine action using a Tiered Priority Cascade:
 
@@ -323,27 +909,59 @@ class RepositoryDistiller:
           Tier 3 (Scope): whitelist.directories
             - Must be inside at least one whitelisted directory to proceed.
 
-          Tier 4 (Sanity): blacklist.directories, blacklist.extensions, max_file_size_mb
-            - General exclusions applied only after Tier 3 passes.
+          Tier 4 (Sanity): blacklist.extensions, max_file_size_mb, blacklist.directories
+            - General exclusions. The size cap is evaluated right after Tier 1 since
+              it is the cheapest veto; it can only turn a SKIP into another SKIP.
+
+        st (the file's stat_result) may be supplied to avoid a stat() call.
         """
         path = path.resolve()
-        base_path = base_path.resolve()
-
-        rel_posix = self._to_rel_posix(path, base_path)
+        # Absolute bases are resolved once; relative ones depend on the cwd
+        resolved_base = self._resolved_bases.get(base_path)
+        if resolved_base is None:
+            resolved_base = base_path.resolve()
+            if base_path.is_absolute():
+                self._resolved_bases[base_path] = resolved_base
+
+        rel_posix = self._to_rel_posix(path, resolved_base)
         if rel_posix is None:
             return FilterAction.SKIP, "outside_repository_root"
 
+        if st is None:
+            try:
+                st = path.stat()
+            except OSError:
+                st = None
+        return self._classify(rel_posix, path.name, st)
+
+    def _classify(
+        self,
+        rel_posix: str,
+        filename: str,
+        st: Optional[os.stat_result],
+    ) -> Tuple[FilterAction, Optional[str]]:
+        """
+        Run the Priority Cascade for a file whose repository-relative POSIX path,
+        filename and stat_result (None if stat failed) are already known; all
+        checks work on these values without further filesystem calls.
+        """
+        is_regular = st is not None and stat.S_ISREG(st.st_mode)
+
         # --- Tier 1: Golden Ticket (explicit file whitelist) ---
-        if self._match_file_patterns(rel_posix, self.config.whitelist_files):
-            if self._should_sample_data_file(path):
+        if self._whitelist_files.match(rel_posix, filename):
+            if is_regular and self._should_sample_data_file(_suffix_lower(filename)):
                 return FilterAction.SAMPLE, "tier1_whitelist_file_sampled"
             return FilterAction.COPY, "tier1_whitelist_file"
 
+        # Size cap (a Tier 4 rule): every outcome past Tier 1 other than COPY/SAMPLE
+        # is SKIP, so the cheapest veto can run first without changing the action.
+        if is_regular and st.st_size > self._max_file_size_bytes:
+            return FilterAction.SKIP, f"tier4_file_size>{self.config.max_file_size_mb}MB"
+
         # --- Tier 2: Explicit Veto (explicit file blacklist + filename regex patterns) ---
-        if self._match_file_patterns(rel_posix, self.config.blacklist_files):
+        if self._blacklist_files.match(rel_posix, filename):
             return FilterAction.SKIP, "tier2_blacklist_file"
 
-        filename = path.name
         # Tier 2b: Datetime-stamp veto (YYYYMMDD)
         stamp = self._filename_contains_yyyymmdd_stamp(filename)
         if stamp:
@@ -354,31 +972,38 @@ class RepositoryDistiller:
         if sub:
             return FilterAction.SKIP, f"tier2_blacklist_filename_substring:{sub}"
 
-        for pattern in self.config.blacklist_patterns:
-            try:
-                if pattern.search(filename):
-                    return FilterAction.SKIP, f"tier2_blacklist_pattern:{pattern.pattern}"
-            except Exception as e:
-                self.logger.warning(f"Regex evaluation failed for '{pattern.pattern}': {e}")
+        # Tier 2d: Regex vetoes. The fused alternation rejects most filenames in
+        # one scan. On a hit, its group index names a pattern that matched; only
+        # patterns listed before it need re-checking to report the first in list
+        # order, which the slice ends with.
+        patterns = self.config.blacklist_patterns
+        if patterns:
+            if self._blacklist_pattern_union is not None:
+                m = self._blacklist_pattern_union.search(filename)
+                # Leftmost match only: an earlier-listed pattern may match further
+                # right, so the loop below re-checks everything up to this one.
+                patterns = patterns[:m.lastindex] if m else ()
+            for pattern in patterns:
+                try:
+                    if pattern.search(filename):
+                        return FilterAction.SKIP, f"tier2_blacklist_pattern:{pattern.pattern}"
+                except Exception as e:
+                    self.logger.warning(f"Regex evaluation failed for '{pattern.pattern}': {e}")
 
         # --- Tier 3: Scope check (whitelist-only mode for directories) ---
-        if not self._match_dir_patterns(rel_posix, self.config.whitelist_directories):
+        if not self._whitelist_dirs.match_file(rel_posix):
             return FilterAction.SKIP, "tier3_not_in_whitelist_scope"
 
-        # --- Tier 4: Sanity checks (general exclusions) ---
-        if self._match_dir_patterns(rel_posix, self.config.blacklist_directories):
-            return FilterAction.SKIP, "tier4_blacklist_directory"
-
-        if path.suffix.lower() in self.config.blacklist_extensions:
-            return FilterAction.SKIP, f"tier4_blacklist_ext:{path.suffix.lower()}"
+        # --- Tier 4: Sanity checks (general exclusions), cheapest first ---
+        ext = _suffix_lower(filename)
+        if ext in self._blacklist_extensions:
+            return FilterAction.SKIP, f"tier4_blacklist_ext:{ext}"
 
-        if path.is_file():
-            size_mb = path.stat().st_size / (1024 * 1024)
-            if size_mb > self.config.max_file_size_mb:
-                return FilterAction.SKIP, f"tier4_file_size>{self.config.max_file_size_mb}MB"
+        if self._blacklist_dirs.match_file(rel_posix):
+            return FilterAction.SKIP, "tier4_blacklist_directory"
 
         # Final: sample vs copy (within allowed scope)
-        if self._should_sample_data_file(path):
+        if is_regular and self._should_sample_data_file(ext):
             return FilterAction.SAMPLE, "tier4_sampled"
         return FilterAction.COPY, "tier4_copied"
 
@@ -386,152 +1011,514 @@ class RepositoryDistiller:
     # Sampling implementations
     # =========================================================================
 
+    @staticmethod
+    def _scan_delimited_lines(src, delimiter: bytes) -> Tuple[int, bool, bool, int]:
+        """
+        Count lines in a binary file object in large chunks.
+
+        Returns (line_count, has_quotes, has_bare_cr, max_fields). Unless both
+        flags are False, a CSV row may not correspond to exactly one
+        newline-terminated line. Bare CRs are counted as line ends too, so
+        line_count is always an upper bound on the number of rows csv.reader
+        would produce. max_fields is the widest LF-terminated line measured in
+        delimiter-separated fields; it equals the widest row only when both
+        flags are False.
+        """
+        # Every byte except the delimiter and LF, for bytes.translate() to delete
+        others = bytes(b for b in range(256) if b not in delimiter and b != 0x0A)
+        newlines = 0
+        has_quotes = False
+        has_bare_cr = False
+        max_delims = 0
+        partial = b''
+        last = b''
+        while True:
+            chunk = src.read(_SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            if chunk.endswith(b'\r'):
+                # Keep a CRLF pair inside one chunk
+                chunk += src.read(1)
+            newlines += chunk.count(b'\n')
+            bare_crs = chunk.count(b'\r') - chunk.count(b'\r\n')
+            if bare_crs:
+                newlines += bare_crs
+                has_bare_cr = True
+            if not has_quotes and b'"' in chunk:
+                has_quotes = True
+            # Widest line: with everything else deleted, each line is a run of
+            # delimiters, so grow the maximum while a longer run exists. The
+            # unfinished last line is carried over to the next chunk.
+            kept = partial + chunk.translate(None, others)
+            while delimiter * (max_delims + 1) in kept:
+                max_delims += 1
+            partial = kept[kept.rfind(b'\n') + 1:]
+            last = chunk[-1:]
+        line_count = newlines + (1 if last and last not in (b'\n', b'\r') else 0)
+        return line_count, has_quotes, has_bare_cr, max_delims + 1
+
+    @staticmethod
+    def _read_tail_lines(src, size: int, n: int) -> bytes:
+        """Return the raw bytes of the last n lines, seeking backwards from EOF."""
+        if n <= 0:
+            return b''
+        block = _TAIL_BLOCK_BYTES
+        while True:
+            start = max(0, size - block)
+            src.seek(start)
+            data = src.read(size - start)
+            pos = len(data) - 1 if data.endswith(b'\n') else len(data)
+            for _ in range(n):
+                pos = data.rfind(b'\n', 0, pos)
+                if pos < 0:
+                    break
+            if pos >= 0:
+                return data[pos + 1:]
+            if start == 0:
+                return data
+            block *= 2
+
     def _sample_delimited_file(self, source: Path, destination: Path, delimiter: str) -> bool:
         """
-        Stream-sample a delimited text file (CSV/TSV) by writing:
+        Sample a delimited text file (CSV/TSV) by writing:
           [header?] + first N rows + separator row + last M rows
 
-        This avoids loading the entire file into memory.
+        When no row can span lines (no quote characters), sampling works on raw
+        bytes: one chunked newline-counting pass, the head read from the start,
+        the tail read backwards from EOF, both copied verbatim. Otherwise rows are
+        streamed through csv.reader. Neither path loads the file into memory.
         """
         try:
-            source = source.resolve()
-            destination = destination.resolve()
-            destination.parent.mkdir(parents=True, exist_ok=True)
 
             include_header = self.config.data_sampling_include_header
             head_n = max(0, int(self.config.data_sampling_head_rows))
             tail_n = max(0, int(self.config.data_sampling_tail_rows))
 
-            header: Optional[List[str]] = None
-            head_rows: List[List[str]] = []
-            tail_rows: deque = deque(maxlen=tail_n)
-            total_data_rows = 0
-            num_cols = 1
+            with open(source, 'rb') as src:
+                _advise_sequential(src.fileno())
+                total_lines, has_quotes, has_bare_cr, max_fields = self._scan_delimited_lines(
+                    src, delimiter.encode('utf-8')
+                )
+                if not has_quotes and not has_bare_cr:
+                    return self._sample_delimited_raw(
+                        src, source, destination, delimiter, total_lines, max_fields,
+                        include_header, head_n, tail_n,
+                    )
+
+                # Every CSV row ends at one of the counted line ends, so a file with
+                # few enough lines is copied intact without parsing it.
+                max_data_rows = total_lines - (1 if include_header else 0)
+                if max_data_rows <= (head_n + tail_n):
+                    _fast_copy(source, destination)
+                    self.logger.info(
+                        f"SAMPLED[DELIM - copied intact]: {source.name} (at most {max_data_rows} data rows)"
+                    )
+                    return True
 
-            with open(source, 'r', encoding='utf-8', newline='', errors='replace') as src:
-                reader = csv.reader(src, delimiter=delimiter)
+                if not has_bare_cr:
+                    return self._sample_delimited_spans(
+                        src, source, destination, delimiter, include_header, head_n, tail_n,
+                    )
 
-                for row_idx, row in enumerate(reader):
-                    # Track columns for nicer separator formatting
-                    if row and len(row) > num_cols:
-                        num_cols = len(row)
+            return self._sample_delimited_parsed(source, destination, delimiter, include_header, head_n, tail_n)
 
-                    if row_idx == 0 and include_header:
-                        header = row
-                        continue
+        except Exception as e:
+            self.logger.error(f"Error sampling delimited file {source.name}: {e}")
+            return False
+
+    def _sample_delimited_raw(
+        self,
+        src,
+        source: Path,
+        destination: Path,
+        delimiter: str,
+        total_lines: int,
+        num_cols: int,
+        include_header: bool,
+        head_n: int,
+        tail_n: int,
+    ) -> bool:
+        """
+        Byte-level head/tail sampling for files where one line is one row.
 
-                    total_data_rows += 1
-                    if len(head_rows) < head_n:
-                        head_rows.append(row)
+        num_cols is the widest row in the file (header included), which sizes the
+        separator row as the csv-based paths do.
+        """
+        has_header = include_header and total_lines > 0
+        total_data_rows = total_lines - (1 if has_header else 0)
+
+        if total_lines == 0:
+            self.logger.warning(f"Empty delimited file: {source}")
+            _fast_copy(source, destination)
+            return True
+
+        if total_data_rows <= (head_n + tail_n):
+            _fast_copy(source, destination)
+            self.logger.info(f"SAMPLED[DELIM - copied intact]: {source.name} ({total_data_rows} data rows)")
+            return True
+
+        src.seek(0)
+        first_line = src.readline()
+        head_count = head_n + (1 if has_header else 0)
+        head_lines = [first_line] + [src.readline() for _ in range(head_count - 1)] if head_count else []
+        size = os.fstat(src.fileno()).st_size
+        tail = self._read_tail_lines(src, size, tail_n)
+
+        delim = delimiter.encode('utf-8')
+        omitted = total_data_rows - head_n - tail_n
+        eol = b'\r\n' if first_line.endswith(b'\r\n') else b'\n'
+        note = f"... ({omitted} rows omitted) ...".encode('utf-8')
+        sep_row = note + delim * max(0, num_cols - 1) + eol
+
+        with open(destination, 'wb') as dst:
+            dst.writelines(head_lines)
+            dst.write(sep_row)
+            dst.write(tail)
+
+        self.logger.info(f"SAMPLED[DELIM]: {source.name} ({total_data_rows} data rows)")
+        return True
+
+    def _sample_delimited_spans(
+        self,
+        src,
+        source: Path,
+        destination: Path,
+        delimiter: str,
+        include_header: bool,
+        head_n: int,
+        tail_n: int,
+    ) -> bool:
+        """
+        Quoted files (LF/CRLF line ends): find row boundaries with csv.reader,
+        then copy the head and tail byte ranges verbatim.
+
+        csv.reader is fed the file's binary lines one at a time and never reads
+        past the end of the row it returns, so the bytes consumed so far mark
+        where each row ends. The head is one range from the start of the file;
+        the tail is one range from the start of the first tail row (kept in a
+        ring buffer of row start offsets) to EOF.
+        """
+        pos = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal pos
+            for raw_line in src:
+                pos += len(raw_line)
+                yield raw_line.decode('utf-8', errors='replace')
+
+        src.seek(0)
+        reader = csv.reader(lines(), delimiter=delimiter)
+        num_cols = 1
+
+        if include_header:
+            header = next(reader, None)
+            if header and len(header) > num_cols:
+                num_cols = len(header)
+
+        head_end = pos
+        row_starts = array('q', bytes(8 * tail_n))
+        total_data_rows = 0
+        row_start = pos
+        for row in reader:
+            # Track columns for nicer separator formatting
+            if len(row) > num_cols:
+                num_cols = len(row)
+            if total_data_rows < head_n:
+                head_end = pos
+            if tail_n:
+                row_starts[total_data_rows % tail_n] = row_start
+            total_data_rows += 1
+            row_start = pos
+
+        if total_data_rows <= (head_n + tail_n):
+            _fast_copy(source, destination)
+            self.logger.info(f"SAMPLED[DELIM - copied intact]: {source.name} ({total_data_rows} data rows)")
+            return True
+
+        src.seek(0)
+        first_line = src.readline()
+        src.seek(0)
+        head = src.read(head_end)
+        if tail_n:
+            src.seek(row_starts[total_data_rows % tail_n])
+            tail = src.read()
+        else:
+            tail = b''
+
+        omitted = total_data_rows - head_n - tail_n
+        delim = delimiter.encode('utf-8')
+        eol = b'\r\n' if first_line.endswith(b'\r\n') else b'\n'
+        note = f"... ({omitted} rows omitted) ...".encode('utf-8')
+
+        with open(destination, 'wb') as dst:
+            dst.write(head)
+            dst.write(note + delim * max(0, num_cols - 1) + eol)
+            dst.write(tail)
+
+        self.logger.info(f"SAMPLED[DELIM]: {source.name} ({total_data_rows} data rows)")
+        return True
+
+    def _sample_delimited_parsed(
+        self,
+        source: Path,
+        destination: Path,
+        delimiter: str,
+        include_header: bool,
+        head_n: int,
+        tail_n: int,
+    ) -> bool:
+        """Stream rows through csv.reader and re-serialize them; used for files with bare CR line ends."""
+        header: Optional[List[str]] = None
+        head_rows: List[List[str]] = []
+        tail_rows: deque = deque(maxlen=tail_n)
+        total_data_rows = 0
+        num_cols = 1
+
+        with open(source, 'r', encoding='utf-8', newline='', errors='replace') as src:
+            reader = csv.reader(src, delimiter=delimiter)
+
+            if include_header:
+                header = next(reader, None)
+                if header and len(header) > num_cols:
+                    num_cols = len(header)
+
+            # Rows past the head go to the bounded tail; once more than
+            # head_n + tail_n rows are seen it holds exactly the last tail_n.
+            for row in reader:
+                # Track columns for nicer separator formatting
+                if len(row) > num_cols:
+                    num_cols = len(row)
+
+                total_data_rows += 1
+                if len(head_rows) < head_n:
+                    head_rows.append(row)
+                else:
                     tail_rows.append(row)
 
-            # Empty file: copy intact
-            if header is None and total_data_rows == 0:
-                self.logger.warning(f"Empty delimited file: {source}")
-                shutil.copy2(source, destination)
-                return True
+        # Empty file: copy intact
+        if header is None and total_data_rows == 0:
+            self.logger.warning(f"Empty delimited file: {source}")
+            _fast_copy(source, destination)
+            return True
 
-            # Small enough: copy intact
-            if total_data_rows <= (head_n + tail_n):
-                shutil.copy2(source, destination)
-                self.logger.info(f"SAMPLED[DELIM - copied intact]: {source.name} ({total_data_rows} data rows)")
-                return True
+        # Small enough: copy intact
+        if total_data_rows <= (head_n + tail_n):
+            _fast_copy(source, destination)
+            self.logger.info(f"SAMPLED[DELIM - copied intact]: {source.name} ({total_data_rows} data rows)")
+            return True
 
-            omitted = total_data_rows - len(head_rows) - len(tail_rows)
+        omitted = total_data_rows - len(head_rows) - len(tail_rows)
 
-            with open(destination, 'w', encoding='utf-8', newline='') as dst:
-                writer = csv.writer(dst, delimiter=delimiter)
+        with open(destination, 'w', encoding='utf-8', newline='') as dst:
+            writer = csv.writer(dst, delimiter=delimiter)
 
-                if header is not None:
-                    writer.writerow(header)
-                    if len(header) > num_cols:
-                        num_cols = len(header)
+            if header is not None:
+                writer.writerow(header)
+                if len(header) > num_cols:
+                    num_cols = len(header)
 
-                for r in head_rows:
-                    writer.writerow(r)
+            for r in head_rows:
+                writer.writerow(r)
 
-                note = f"... ({omitted} rows omitted) ..."
-                sep_row = [note] + ([''] * max(0, num_cols - 1))
-                writer.writerow(sep_row)
+            note = f"... ({omitted} rows omitted) ..."
+            sep_row = [note] + ([''] * max(0, num_cols - 1))
+            writer.writerow(sep_row)
 
-                for r in list(tail_rows):
-                    writer.writerow(r)
+            for r in list(tail_rows):
+                writer.writerow(r)
 
-            self.logger.info(f"SAMPLED[DELIM]: {source.name} ({total_data_rows} data rows)")
-            return True
+        self.logger.info(f"SAMPLED[DELIM]: {source.name} ({total_data_rows} data rows)")
+        return True
 
-        except Exception as e:
-            self.logger.error(f"Error sampling delimited file {source.name}: {e}")
-            return False
+    @staticmethod
+    def _load_json_array_sample(
+        source: Path, head_limit: int, tail_limit: int
+    ) -> Optional[Tuple[int, list, list]]:
+        """
+        Parse a JSON file in memory; return (total, head, tail) for arrays, else None.
+
+        Always parsed with the stdlib: orjson turns integers wider than 64 bits
+        into floats instead of rejecting them, which would silently change
+        numbers in the sample.
+        """
+        with open(source, 'rb') as src:
+            raw = src.read()
+
+        content = raw.decode('utf-8', errors='replace').strip()
+        data = json.loads(content) if content else None
+        if not isinstance(data, list):
+            return None
+        return len(data), data[:head_limit], (data[-tail_limit:] if tail_limit > 0 else [])
+
+    @staticmethod
+    def _stream_json_array_sample(
+        source: Path, head_limit: int, tail_limit: int
+    ) -> Optional[Tuple[int, list, list]]:
+        """
+        Stream a JSON file; return (total, head, tail) for arrays, else None.
+
+        Items are decoded one at a time with JSONDecoder.raw_decode, keeping the
+        first head_limit items and the last tail_limit items (via a bounded deque),
+        so memory use is independent of the array length.
+        """
+        decoder = json.JSONDecoder()
+        head: list = []
+        tail: deque = deque(maxlen=tail_limit)
+        total = 0
+
+        with open(source, 'r', encoding='utf-8', errors='replace') as src:
+            buf = ''
+            pos = 0
+            eof = False
+
+            def refill(min_read: int = _SCAN_CHUNK_BYTES) -> None:
+                nonlocal buf, pos, eof
+                chunk = src.read(max(min_read, len(buf) - pos))
+                if not chunk:
+                    eof = True
+                buf = buf[pos:] + chunk
+                pos = 0
+
+            def skip_ws() -> None:
+                nonlocal pos
+                while True:
+                    pos = _JSON_WS.match(buf, pos).end()
+                    if pos < len(buf) or eof:
+                        return
+                    refill()
+
+            skip_ws()
+            if pos >= len(buf):
+                return None
+            if buf[pos] != '[':
+                # Not an array: parse the whole document like the in-memory path
+                # does, so invalid JSON raises (and is reported) at any size.
+                content = (buf[pos:] + src.read()).strip()
+                data = json.loads(content) if content else None
+                if not isinstance(data, list):
+                    return None
+                return len(data), data[:head_limit], (data[-tail_limit:] if tail_limit > 0 else [])
+            pos += 1
+
+            expect_item = True
+            while True:
+                skip_ws()
+                if pos >= len(buf):
+                    raise ValueError("unexpected end of JSON array")
+                c = buf[pos]
+                if c == ']' and (total == 0 or not expect_item):
+                    pos += 1
+                    break
+                if not expect_item:
+                    if c != ',':
+                        raise ValueError(f"expected ',' or ']' but found {c!r}")
+                    pos += 1
+                    expect_item = True
+                    continue
+
+                # Decode one item, pulling more text until it is complete. A number
+                # whose trailing digits/exponent reach the buffer end may be truncated.
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(buf, pos)
+                        if eof or _JSON_NUMBER_CHARS.match(buf, end).end() < len(buf):
+                            break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    refill()
+
+                total += 1
+                if len(head) < head_limit:
+                    head.append(item)
+                tail.append(item)
+                pos = end
+                expect_item = False
+
+            # Only whitespace may follow the closing bracket
+            while True:
+                if buf[pos:].strip():
+                    raise ValueError("extra data after JSON array")
+                pos = len(buf)
+                if eof:
+                    break
+                refill()
+
+        return total, head, list(tail)
 
     def _sample_json_file(self, source: Path, destination: Path) -> bool:
         """Sample a JSON/JSONL file by copying head + tail objects."""
         try:
-            source = source.resolve()
-            destination = destination.resolve()
-            destination.parent.mkdir(parents=True, exist_ok=True)
-
-            # JSONL: stream lines
-            if source.suffix.lower() == '.jsonl':
-                head: List[str] = []
-                tail: deque = deque(maxlen=max(0, int(self.config.data_sampling_tail_rows)))
+
+            # JSONL: stream lines. Head lines are kept; for the tail only the byte
+            # offsets of the last tail_n non-empty lines are kept (in a ring
+            # buffer), and those lines are re-read once the count is known.
+            if _suffix_lower(source.name) == '.jsonl':
+                head_n = max(0, int(self.config.data_sampling_head_rows))
+                tail_n = max(0, int(self.config.data_sampling_tail_rows))
+                head: List[bytes] = []
+                tail_offsets = array('q', bytes(8 * tail_n))
                 total_objects = 0
+                pos = 0
 
-                with open(source, 'r', encoding='utf-8', errors='replace') as src:
+                with open(source, 'rb') as src:
                     for raw_line in src:
-                        line = raw_line.rstrip('\n\r')
-                        if not line.strip():
-                            continue
-                        total_objects += 1
-                        if len(head) < self.config.data_sampling_head_rows:
-                            head.append(line)
-                        tail.append(line)
-
-                if total_objects == 0:
-                    self.logger.warning(f"Empty JSONL file: {source}")
-                    shutil.copy2(source, destination)
-                    return True
+                        if raw_line.strip():
+                            if len(head) < head_n:
+                                head.append(raw_line.rstrip(b'\r\n'))
+                            if tail_n:
+                                tail_offsets[total_objects % tail_n] = pos
+                            total_objects += 1
+                        pos += len(raw_line)
+
+                    if total_objects == 0:
+                        self.logger.warning(f"Empty JSONL file: {source}")
+                        _fast_copy(source, destination)
+                        return True
 
-                if total_objects <= (self.config.data_sampling_head_rows + self.config.data_sampling_tail_rows):
-                    shutil.copy2(source, destination)
-                    self.logger.info(f"SAMPLED[JSONL - copied intact]: {source.name} ({total_objects} objects)")
-                    return True
+                    if total_objects <= (head_n + tail_n):
+                        _fast_copy(source, destination)
+                        self.logger.info(f"SAMPLED[JSONL - copied intact]: {source.name} ({total_objects} objects)")
+                        return True
+
+                    tail: List[bytes] = []
+                    for k in range(total_objects - tail_n, total_objects):
+                        src.seek(tail_offsets[k % tail_n])
+                        tail.append(src.readline().rstrip(b'\r\n'))
 
                 omitted = total_objects - len(head) - len(tail)
-                with open(destination, 'w', encoding='utf-8') as dst:
+                with open(destination, 'wb') as dst:
                     if head:
-                        dst.write('\n'.join(head))
-                        dst.write('\n\n')
-                    dst.write(f"... ({omitted} objects omitted) ...\n\n")
-                    dst.write('\n'.join(list(tail)))
+                        dst.write(b'\n'.join(head))
+                        dst.write(b'\n\n')
+                    dst.write(f"... ({omitted} objects omitted) ...\n\n".encode('utf-8'))
+                    dst.write(b'\n'.join(tail))
 
                 self.logger.info(f"SAMPLED[JSONL]: {source.name} ({total_objects} objects)")
                 return True
 
-            # Regular JSON: load and sample arrays only
-            with open(source, 'r', encoding='utf-8', errors='replace') as src:
-                content = src.read().strip()
-
+            # Regular JSON: sample top-level arrays only. Large files are streamed
+            # item by item so only the head and tail items are held in memory.
+            head_limit = max(0, int(self.config.data_sampling_head_rows))
+            tail_limit = max(0, int(self.config.data_sampling_tail_rows))
             try:
-                data = json.loads(content) if content else None
-            except json.JSONDecodeError as e:
+                if source.stat().st_size > _JSON_STREAM_THRESHOLD_BYTES:
+                    sample = self._stream_json_array_sample(source, head_limit, tail_limit)
+                else:
+                    sample = self._load_json_array_sample(source, head_limit, tail_limit)
+            except ValueError as e:
                 self.logger.warning(f"Invalid JSON in {source.name}: {e}. Copying as-is.")
-                shutil.copy2(source, destination)
+                _fast_copy(source, destination)
                 return True
 
-            if isinstance(data, list):
-                total_items = len(data)
-                head_limit = max(0, int(self.config.data_sampling_head_rows))
-                tail_limit = max(0, int(self.config.data_sampling_tail_rows))
+            if sample is not None:
+                total_items, head, tail = sample
 
                 if total_items <= (head_limit + tail_limit):
-                    shutil.copy2(source, destination)
+                    _fast_copy(source, destination)
                     self.logger.info(f"SAMPLED[JSON - copied intact]: {source.name} ({total_items} items)")
                     return True
 
-                head = data[:head_limit]
-                tail = data[-tail_limit:] if tail_limit > 0 else []
-
                 sampled = {
                     "_sampled": True,
                     "_total_items": total_items,
@@ -540,15 +1527,14 @@ class RepositoryDistiller:
                     "tail": tail,
                 }
 
-                with open(destination, 'w', encoding='utf-8') as dst:
-                    json.dump(sampled, dst, indent=2, ensure_ascii=False)
+                destination.write_bytes(_json_dumps_bytes(sampled))
 
                 self.logger.info(f"SAMPLED[JSON]: {source.name} ({total_items} items)")
                 return True
 
             # Objects/primitives: copy as-is
-            shutil.copy2(source, destination)
-            self.logger.debug(f"JSON object/primitive (not sampled): {source.name}")
+            _fast_copy(source, destination)
+            self.logger.debug("JSON object/primitive (not sampled): %s", source.name)
             return True
 
         except Exception as e:
@@ -559,107 +1545,153 @@ class RepositoryDistiller:
     # File processing & distillation
     # =========================================================================
 
+    def _log_path(self, path: Path) -> str:
+        """Repo-relative POSIX path for log messages, falling back to the full path."""
+        if self._source_root is not None:
+            try:
+                return path.relative_to(self._source_root).as_posix()
+            except ValueError:
+                pass
+        return str(path)
+
+    def _ensure_parent_dir(self, destination: Path) -> None:
+        """Create destination's parent once per directory instead of once per file."""
+        parent = destination.parent
+        if parent in self._created_dirs:
+            return
+        parent.mkdir(parents=True, exist_ok=True)
+        # set.add is atomic under the GIL; a racing duplicate mkdir is harmless.
+        self._created_dirs.add(parent)
+
     def process_file(self, source: Path, destination: Path, action: FilterAction) -> bool:
         """Process a single file according to the determined action."""
         try:
-            source = source.resolve()
-            destination = destination.resolve()
-            destination.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_parent_dir(destination)
 
             if action == FilterAction.COPY:
-                shutil.copy2(source, destination)
-                self.logger.debug(f"COPIED: {source}")
-                self.stats.copied += 1
+                _fast_copy(source, destination)
+                if self._debug:
+                    self.logger.debug("COPIED: %s", self._log_path(source))
+                with self._stats_lock:
+                    self.stats.copied += 1
                 return True
 
             if action == FilterAction.SAMPLE:
-                ext = source.suffix.lower()
-                if ext == '.csv':
-                    ok = self._sample_delimited_file(source, destination, delimiter=',')
-                elif ext == '.tsv':
-                    ok = self._sample_delimited_file(source, destination, delimiter='\t')
-                elif ext in {'.json', '.jsonl'}:
-                    ok = self._sample_json_file(source, destination)
+                ext = _suffix_lower(source.name)
+                sampler = self._samplers.get(ext)
+                if sampler is not None:
+                    ok = sampler(source, destination)
                 else:
                     self.logger.warning(f"Unknown sampling type '{ext}' for {source}. Copying as-is.")
-                    shutil.copy2(source, destination)
+                    _fast_copy(source, destination)
                     ok = True
 
-                if ok:
-                    self.stats.sampled += 1
-                else:
-                    self.stats.errors += 1
+                with self._stats_lock:
+                    if ok:
+                        self.stats.sampled += 1
+                    else:
+                        self.stats.errors += 1
                 return ok
 
             # SKIP should be handled by caller loop
-            self.stats.skipped += 1
+            with self._stats_lock:
+                self.stats.skipped += 1
             return True
 
         except Exception as e:
             self.logger.error(f"Error processing {source}: {e}")
-            self.stats.errors += 1
+            with self._stats_lock:
+                self.stats.errors += 1
             return False
 
-    def distill(self, source_dir: Path, dest_dir: Path, dry_run: bool = False) -> bool:
-        """Main distillation process: walk source directory and filter to destination."""
+    def distill(self, source_dir: Path, dest_dir: Path, dry_run: bool = False, force: bool = False) -> bool:
+        """
+        Main distillation process: walk source directory and filter to destination.
+
+        With force=True an existing destination is replaced without prompting.
+        """
         # Resolve all paths to absolute paths (prevents relative_to() mismatch errors)
         source_dir = source_dir.resolve()
         dest_dir = dest_dir.resolve()
+        self._source_root = source_dir
+        self._debug = debug = self.logger.isEnabledFor(logging.DEBUG)
+        self._whitelist_dirs.clear_cache()
+        self._blacklist_dirs.clear_cache()
 
         self.logger.info(f"{'[DRY RUN] ' if dry_run else ''}Starting distillation...")
         self.logger.info(f"Source: {source_dir}")
         self.logger.info(f"Destination: {dest_dir}")
         self.logger.info(f"Configuration: AI Coding Env = {self.config.ai_coding_env}")
 
-        if not source_dir.exists():
+        try:
+            source_mode = source_dir.stat().st_mode
+        except FileNotFoundError:
             self.logger.error(f"Source directory does not exist: {source_dir}")
             return False
-        if not source_dir.is_dir():
+        if not stat.S_ISDIR(source_mode):
             self.logger.error(f"Source path is not a directory: {source_dir}")
             return False
 
         # Prepare destination directory
         if not dry_run:
             if dest_dir.exists():
-                if not self._confirm_overwrite(dest_dir):
+                if not force and not self._confirm_overwrite(dest_dir):
                     self.logger.info("Operation cancelled by user.")
                     return False
                 shutil.rmtree(dest_dir)
             dest_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs = {dest_dir}
 
-        # Walk the source directory (files only)
+        # Walk the source directory (files only), pruning blacklisted subtrees.
+        # Classification stays on this thread; copy/sample work goes to the pool.
         try:
-            for path in source_dir.rglob('*'):
-                if not path.is_file():
-                    continue
-
-                self.stats.scanned += 1
-                path = path.resolve()
-
-                rel_posix = self._to_rel_posix(path, source_dir)
-                if rel_posix is None:
-                    self.stats.skipped += 1
-                    self.stats.add_skip_reason("outside_repository_root")
-                    continue
-
-                action, reason = self.determine_action(path, source_dir)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pending: Set = set()
+                max_pending = self.max_workers * _PENDING_TASKS_PER_WORKER
+                root_prefix = os.path.join(str(source_dir), '')
+                for entry, rel_posix, st in self._iter_files(source_dir):
+                    self.stats.scanned += 1
+
+                    # The walker builds rel_posix from entry names, which is the
+                    # resolved path for everything but symlinks. A symlink is
+                    # classified (and placed) by its target, so a link cannot
+                    # smuggle in a blacklisted or out-of-scope file.
+                    filename = entry.name
+                    if entry.is_symlink():
+                        target = os.path.realpath(entry.path)
+                        if not target.startswith(root_prefix):
+                            self.stats.skipped += 1
+                            self.stats.add_skip_reason("outside_repository_root")
+                            continue
+                        rel_posix = target[len(root_prefix):].replace(os.sep, '/')
+                        filename = os.path.basename(target)
 
-                if action == FilterAction.SKIP:
-                    self.stats.skipped += 1
-                    self.stats.add_skip_reason(reason or "skip")
-                    self.logger.debug(f"SKIP[{reason}]: {rel_posix}")
-                    continue
+                    action, reason = self._classify(rel_posix, filename, st)
 
-                dest_path = dest_dir / Path(rel_posix)
+                    if action == FilterAction.SKIP:
+                        self.stats.skipped += 1
+                        self.stats.add_skip_reason(reason or "skip")
+                        if debug:
+                            self.logger.debug("SKIP[%s]: %s", reason, rel_posix)
+                        continue
 
-                if dry_run:
-                    self.logger.info(f"[DRY RUN] {action.value}: {rel_posix}")
-                    if action == FilterAction.COPY:
-                        self.stats.copied += 1
-                    elif action == FilterAction.SAMPLE:
-                        self.stats.sampled += 1
-                else:
-                    self.process_file(path, dest_path, action)
+                    if dry_run:
+                        self.logger.info(f"[DRY RUN] {action.value}: {rel_posix}")
+                        if action == FilterAction.COPY:
+                            self.stats.copied += 1
+                        elif action == FilterAction.SAMPLE:
+                            self.stats.sampled += 1
+                    else:
+                        pending.add(pool.submit(
+                            self.process_file, Path(entry.path), dest_dir / rel_posix, action
+                        ))
+                        if len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                future.result()
+
+                for future in pending:
+                    future.result()
 
         except Exception as e:
             self.logger.error(f"Fatal error during distillation: {e}")
@@ -691,13 +1723,17 @@ class RepositoryDistiller:
         self.logger.info(f"Files sampled:        {self.stats.sampled}")
         self.logger.info(f"Files skipped:        {self.stats.skipped}")
         self.logger.info(f"Errors:               {self.stats.errors}")
+        self.logger.info(f"Directories pruned:   {self.stats.pruned_dirs}")
 
         if self.stats.skipped_reasons:
             self.logger.info("\nSkip reasons breakdown:")
-            for reason, count in sorted(self.stats.skipped_reasons.items(), key=lambda x: -x[1]):
+            for reason, count in self.stats.skipped_reasons.most_common():
                 self.logger.info(f"  {reason:34s}: {count:>6d}")
         self.logger.info("=" * 70 + "\n")
 
+        for handler in self.logger.handlers:
+            handler.flush()
+
 
 # ============================================================================
 # CLI INTERFACE
@@ -713,6 +1749,7 @@ Examples:
   python src/repo_distiller.py ./my-repo ./distilled-repo
   uv run python src/repo_distiller.py ./my-repo ./distilled-repo
   python src/repo_distiller.py ./my-repo ./distilled-repo --dry-run
+  python src/repo_distiller.py ./my-repo ./distilled-repo --yes
   python src/repo_distiller.py ./my-repo ./distilled-repo -c custom_config.yaml -v
 
 For more information, see docs/user-manual.md
@@ -724,6 +1761,8 @@ For more information, see docs/user-manual.md
     parser.add_argument('-c', '--config', type=Path, default=Path('./config.yaml'),
                         help='Path to YAML configuration file (default: ./config.yaml)')
     parser.add_argument('-d', '--dry-run', action='store_true', help='Preview actions without copying')
+    parser.add_argument('-y', '--yes', '--force', dest='force', action='store_true',
+                        help='Replace an existing destination without prompting')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose logging (DEBUG)')
     parser.add_argument('--log-dir', type=Path, default=Path('./logs'),
                         help='Directory for log files (default: ./logs)')
@@ -731,11 +1770,13 @@ For more information, see docs/user-manual.md
 
     args = parser.parse_args()
 
-    # Resolve all paths to absolute paths
-    args.source_dir = args.source_dir.resolve()
-    args.destination_dir = args.destination_dir.resolve()
-    args.config = args.config.resolve()
-    args.log_dir = args.log_dir.resolve()
+    # Make all paths absolute without touching the filesystem; distill()
+    # resolves the source and destination itself. '..' is left in place so it
+    # is still applied after symlinks, as the OS would.
+    args.source_dir = args.source_dir.absolute()
+    args.destination_dir = args.destination_dir.absolute()
+    args.config = args.config.absolute()
+    args.log_dir = args.log_dir.absolute()
 
     # Validate source directory exists (even for dry-run)
     if not args.source_dir.exists():
@@ -758,7 +1799,8 @@ def main() -> int:
         success = distiller.distill(
             source_dir=args.source_dir,
             dest_dir=args.destination_dir,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            force=args.force,
         )
 
         if success:
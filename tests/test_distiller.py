@@ -1,5 +1,5 @@
 import logging
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import List, Set
 import re
 
@@ -12,10 +12,10 @@ import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 
-from src.repo_distiller import DistillerConfig, RepositoryDistiller, FilterAction
+from src.repo_distiller import DistillerConfig, RepositoryDistiller, FilterAction, _GlobSet
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def logger():
     log = logging.getLogger("repo_distiller_test")
     log.setLevel(logging.DEBUG)
@@ -142,6 +142,24 @@ def test_tier2_invalid_datetime_stamp_not_vetoed(tmp_path: Path, logger):
     assert reason == "tier4_copied"
 
 
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("log_20240229.txt", "20240229"),
+        ("log_20230229.txt", None),
+        ("log_20000229.txt", "20000229"),
+        ("log_19000229.txt", None),
+        ("log_20240431.txt", None),
+        ("log_00000101.txt", None),
+        ("log_99991231.txt", "99991231"),
+        ("v_123456789.txt", None),
+    ],
+)
+def test_datetime_stamp_calendar_rules(logger, filename: str, expected):
+    d = RepositoryDistiller(make_config(), logger)
+    assert d._filename_contains_yyyymmdd_stamp(filename) == expected
+
+
 def test_tier2_filename_substring_veto_case_insensitive(tmp_path: Path, logger):
     repo = tmp_path / "repo"
     repo.mkdir()
@@ -160,6 +178,53 @@ def test_tier2_filename_substring_veto_case_insensitive(tmp_path: Path, logger):
     assert reason.startswith("tier2_blacklist_filename_substring:")
 
 
+def test_tier2_filename_substring_reports_first_listed_needle(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    f = repo / "src" / "backup_of_old_main.py"
+    write_text(f, "pass")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_filename_substrings=["  ", "old", "BACKUP"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+    action, reason = d.determine_action(f, repo)
+
+    assert action == FilterAction.SKIP
+    assert reason == "tier2_blacklist_filename_substring:old"
+
+
+def test_tier2_filename_substring_length_gate(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_filename_substrings=["BACKUP", "SS.P"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    short = repo / "src" / "a.py"
+    write_text(short, "pass")
+    assert d.determine_action(short, repo) == (FilterAction.COPY, "tier4_copied")
+
+    # 'ß' upper-cases to 'SS', so the 3-character name still contains the 4-character needle
+    grown = repo / "src" / "ß.p"
+    write_text(grown, "pass")
+    assert d.determine_action(grown, repo) == (FilterAction.SKIP, "tier2_blacklist_filename_substring:SS.P")
+
+
+def test_tier2_filename_substring_check_skipped_when_none_configured(logger):
+    class NoUpper(str):
+        def upper(self):
+            raise AssertionError("filename should not be upper-cased")
+
+    d = RepositoryDistiller(make_config(blacklist_filename_substrings=[]), logger)
+    assert d._filename_contains_blacklisted_substring(NoUpper("a_rather_long_module_name.py")) is None
+
+
 def test_tier3_scope_gate_blocks_non_whitelisted_dirs(tmp_path: Path, logger):
     repo = tmp_path / "repo"
     repo.mkdir()
@@ -205,6 +270,27 @@ def test_sampling_csv_integration(tmp_path: Path, logger):
     assert "rows omitted" in out_text
 
 
+@pytest.mark.parametrize("delimiter, ext", [(",", ".csv"), ("\t", ".tsv")])
+def test_sampling_separator_row_spans_widest_row(tmp_path: Path, logger, delimiter: str, ext: str):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    rows = [delimiter.join(["a", "b"])] + [delimiter.join([str(i), "x"]) for i in range(10)]
+    rows[6] = delimiter.join(["wide"] * 6)
+    write_text(repo / "src" / f"data{ext}", "\n".join(rows) + "\n")
+
+    cfg = make_config(whitelist_directories=["src/"], sampling_exts={ext})
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out_lines = (dest / "src" / f"data{ext}").read_text(encoding="utf-8").splitlines()
+    assert out_lines[4] == "... (4 rows omitted) ..." + delimiter * 5
+    assert "wide" not in "\n".join(out_lines)
+
+
 def test_sampling_jsonl_integration(tmp_path: Path, logger):
     repo = tmp_path / "repo"
     repo.mkdir()
@@ -229,3 +315,716 @@ def test_sampling_jsonl_integration(tmp_path: Path, logger):
 
     out_text = out.read_text(encoding="utf-8")
     assert "objects omitted" in out_text
+
+
+def test_blacklisted_directory_is_pruned_during_walk(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    write_text(repo / "src" / "main.py", "print('hi')")
+    write_text(repo / "src" / "node_modules" / "pkg" / "index.js", "x")
+    write_text(repo / "src" / "node_modules" / "pkg" / "lib" / "util.js", "x")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_directories=["src/node_modules/"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, tmp_path / "dest", dry_run=True)
+    assert ok is True
+    assert d.stats.pruned_dirs == 1
+    assert d.stats.scanned == 1
+    assert d.stats.copied == 1
+
+
+def test_blacklisted_directory_not_pruned_when_it_holds_whitelisted_file(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "node_modules" / "lib" / "README.md", "keep me")
+    write_text(repo / "node_modules" / "lib" / "index.js", "x")
+
+    cfg = make_config(
+        whitelist_files=["node_modules/lib/README.md"],
+        whitelist_directories=["src/"],
+        blacklist_directories=["node_modules/"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+    assert d.stats.pruned_dirs == 0
+    assert (dest / "node_modules" / "lib" / "README.md").exists()
+    assert not (dest / "node_modules" / "lib" / "index.js").exists()
+
+
+def test_sibling_of_whitelisted_path_is_still_pruned(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    write_text(repo / "node_modules" / "lib" / "README.md", "keep me")
+    write_text(repo / "node_modules" / "other" / "index.js", "x")
+    write_text(repo / "node_modules" / "other" / "deep" / "util.js", "x")
+
+    cfg = make_config(
+        whitelist_files=["node_modules/lib/README.md"],
+        whitelist_directories=["src/"],
+        blacklist_directories=["node_modules/"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, tmp_path / "dest", dry_run=True)
+    assert ok is True
+    assert d.stats.pruned_dirs == 1
+    assert d.stats.scanned == 1
+
+
+def test_directories_outside_whitelist_scope_are_pruned(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    write_text(repo / "src" / "app" / "main.py", "print('hi')")
+    write_text(repo / "src" / "other" / "skip.py", "x")
+    write_text(repo / "docs" / "guide.md", "x")
+    write_text(repo / "docs" / "keep.md", "keep")
+
+    cfg = make_config(
+        whitelist_files=["docs/keep.md"],
+        whitelist_directories=["src/app/"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, tmp_path / "dest", dry_run=True)
+    assert ok is True
+    # src/other is pruned; src (ancestor of scope) and docs (holds a Tier 1 file) are walked
+    assert d.stats.pruned_dirs == 1
+    assert d.stats.scanned == 3
+    assert d.stats.copied == 2
+
+
+def test_walker_paths_classified_without_resolving_and_symlink_escape_skipped(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "src" / "main.py", "print('hi')")
+    write_text(tmp_path / "outside.py", "secret")
+    try:
+        (repo / "src" / "escape.py").symlink_to(tmp_path / "outside.py")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+
+    cfg = make_config(whitelist_directories=["src/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+    assert (dest / "src" / "main.py").exists()
+    assert not (dest / "src" / "escape.py").exists()
+    assert d.stats.skipped_reasons["outside_repository_root"] == 1
+
+
+def test_in_repo_symlink_classified_and_placed_by_its_target(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "secrets" / "key.txt", "secret")
+    write_text(repo / "src" / "real.py", "x = 1\n")
+    try:
+        (repo / "src" / "creds.txt").symlink_to(repo / "secrets" / "key.txt")
+        (repo / "src" / "alias.py").symlink_to(repo / "src" / "real.py")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+
+    cfg = make_config(whitelist_directories=["src/", "secrets/"], blacklist_directories=["secrets/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+    assert not (dest / "src" / "creds.txt").exists()
+    assert not (dest / "secrets").exists()
+    assert not (dest / "src" / "alias.py").exists()
+    assert (dest / "src" / "real.py").read_text(encoding="utf-8") == "x = 1\n"
+    assert d.stats.skipped_reasons["tier4_blacklist_directory"] == 1
+
+
+def test_force_replaces_existing_destination_without_prompt(tmp_path: Path, logger, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "src" / "main.py", "print('hi')")
+    write_text(dest / "stale.txt", "old")
+
+    def fail_input(*args):
+        raise AssertionError("input() must not be called with force=True")
+
+    monkeypatch.setattr("builtins.input", fail_input)
+
+    cfg = make_config(whitelist_directories=["src/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False, force=True)
+    assert ok is True
+    assert (dest / "src" / "main.py").exists()
+    assert not (dest / "stale.txt").exists()
+
+
+def test_from_yaml_parses_config(tmp_path: Path):
+    cfg_path = tmp_path / "config.yaml"
+    write_text(
+        cfg_path,
+        "max_file_size_mb: 2\n"
+        "whitelist:\n  directories: [src/]\n"
+        "blacklist:\n  extensions: [pyc, .log]\n  patterns: ['^tmp_']\n"
+        "data_sampling:\n  target_extensions: [csv]\n  head_rows: 4\n",
+    )
+
+    cfg = DistillerConfig.from_yaml(cfg_path)
+    assert cfg.max_file_size_mb == 2.0
+    assert cfg.whitelist_directories == ["src/"]
+    assert cfg.blacklist_extensions == [".pyc", ".log"]
+    assert [p.pattern for p in cfg.blacklist_patterns] == ["^tmp_"]
+    assert cfg.data_sampling_extensions == {".csv"}
+    assert cfg.data_sampling_head_rows == 4
+    assert cfg.blacklist_datetime_stamp_yyyymmdd is True
+
+
+def test_from_yaml_reuses_json_sidecar_until_yaml_changes(tmp_path: Path):
+    import os
+
+    cfg_path = tmp_path / "config.yaml"
+    write_text(cfg_path, "max_file_size_mb: 2\n")
+    cache_path = tmp_path / "config.yaml.cache.json"
+
+    assert DistillerConfig.from_yaml(cfg_path).max_file_size_mb == 2.0
+    assert cache_path.exists()
+
+    # A current sidecar is trusted as-is
+    cache_text = cache_path.read_text(encoding="utf-8")
+    cache_path.write_text(cache_text.replace('"max_file_size_mb": 2', '"max_file_size_mb": 3'), encoding="utf-8")
+    assert DistillerConfig.from_yaml(cfg_path).max_file_size_mb == 3.0
+
+    # Editing the YAML invalidates it
+    write_text(cfg_path, "max_file_size_mb: 4\n")
+    st = cfg_path.stat()
+    os.utime(cfg_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert DistillerConfig.from_yaml(cfg_path).max_file_size_mb == 4.0
+
+
+@pytest.mark.parametrize(
+    "pattern, rel_posix",
+    [
+        ("*.md", "README.md"),
+        ("*.md", "docs/guide/intro.md"),
+        ("docs/*.md", "docs/intro.md"),
+        ("docs/*.md", "docs/guide/intro.md"),
+        (".env.*", "src/.env.local"),
+        ("src/[!_]*.py", "src/_private.py"),
+        ("src/[a-c]?.py", "src/b1.py"),
+        ("*.py", "src/py"),
+    ],
+)
+def test_globset_matches_purepath_semantics(pattern: str, rel_posix: str):
+    expected = PurePosixPath(rel_posix).match(pattern)
+    assert _GlobSet([pattern]).match(rel_posix) is expected
+
+
+def test_globset_directory_patterns_use_prefix_semantics():
+    gs = _GlobSet(["node_modules/", "*.egg-info/"], directory=True)
+
+    assert gs.match("node_modules/lib/index.js")
+    assert not gs.match("node_modules_extra/index.js")
+    assert gs.match("pkg.egg-info/PKG-INFO")
+    assert not gs.match("src/main.py")
+
+
+def test_globset_match_file_memoizes_per_parent_until_cleared():
+    gs = _GlobSet(["src/", "*/generated"], directory=True)
+
+    for name in ("a.py", "b.py", "c.py"):
+        assert gs.match_file(f"src/pkg/{name}") == gs.match(f"src/pkg/{name}")
+    assert gs.match_file("lib/generated/x.py")
+    assert not gs.match_file("lib/other/x.py")
+    assert set(gs._parent_cache) == {"src/pkg", "lib/generated", "lib/other"}
+
+    gs.clear_cache()
+    assert gs._parent_cache == {}
+
+
+def test_tier4_extension_checked_before_directory_blacklist(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    f = repo / "src" / "build" / "logo.png"
+    write_text(f, "png")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_directories=["src/build/"],
+        blacklist_extensions=[".png"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+    action, reason = d.determine_action(f, repo)
+
+    assert action == FilterAction.SKIP
+    assert reason == "tier4_blacklist_ext:.png"
+
+
+def test_extension_lists_match_case_insensitively(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    logo = repo / "src" / "Logo.png"
+    table = repo / "src" / "table.csv"
+    write_text(logo, "png")
+    write_text(table, "a,b\n1,2\n")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_extensions=[".PNG"],
+        sampling_exts={".CSV"},
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    assert d.determine_action(logo, repo) == (FilterAction.SKIP, "tier4_blacklist_ext:.png")
+    assert d.determine_action(table, repo)[0] == FilterAction.SAMPLE
+
+
+def test_size_cap_checked_right_after_tier1(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    big_veto = repo / "src" / "data_backup.txt"
+    write_bytes(big_veto, 2 * 1024 * 1024)
+    big_whitelisted = repo / "other" / "keep.txt"
+    write_bytes(big_whitelisted, 2 * 1024 * 1024)
+
+    cfg = make_config(
+        max_file_size_mb=1.0,
+        whitelist_files=["other/keep.txt"],
+        whitelist_directories=["src/"],
+        blacklist_filename_substrings=["BACKUP"],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    action, reason = d.determine_action(big_veto, repo)
+    assert action == FilterAction.SKIP
+    assert reason == "tier4_file_size>1.0MB"
+
+    action, reason = d.determine_action(big_whitelisted, repo)
+    assert action == FilterAction.COPY
+    assert reason == "tier1_whitelist_file"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_distill_copies_all_files_with_worker_pool(tmp_path: Path, logger, max_workers):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    for i in range(40):
+        write_text(repo / "src" / f"pkg{i % 4}" / f"mod{i}.py", f"x = {i}\n")
+
+    cfg = make_config(whitelist_directories=["src/"])
+    # With one worker the in-flight window (4 tasks) fills and drains repeatedly
+    d = RepositoryDistiller(cfg, logger, max_workers=max_workers)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+    assert d.stats.copied == 40
+    assert (dest / "src" / "pkg3" / "mod39.py").read_text(encoding="utf-8") == "x = 39\n"
+
+
+def test_sampling_csv_with_quoted_multiline_fields_keeps_rows_intact(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    rows = [f'{i},"line one\nline two {i}"' for i in range(20)]
+    write_text(repo / "src" / "notes.csv", "id,text\n" + "\n".join(rows) + "\n")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        sampling_exts={".csv"},
+        blacklist_datetime_stamp_yyyymmdd=False,
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out_text = (dest / "src" / "notes.csv").read_text(encoding="utf-8")
+    assert "(14 rows omitted)" in out_text
+    assert "line two 19" in out_text
+
+
+def test_small_quoted_csv_copied_intact_without_parsing(tmp_path: Path, logger, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    text = 'id,note\n1,"a, b"\n2,"line one\nline two"\n'
+    write_text(repo / "src" / "notes.csv", text)
+
+    cfg = make_config(whitelist_directories=["src/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("small file should not be parsed")
+
+    monkeypatch.setattr(d, "_sample_delimited_parsed", fail_parse)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+    assert (dest / "src" / "notes.csv").read_bytes() == (repo / "src" / "notes.csv").read_bytes()
+
+
+def test_sampling_quoted_csv_keeps_original_bytes(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    rows = [f'{i},"say ""hi""\r\nagain {i}",x' for i in range(12)]
+    (repo / "src").mkdir()
+    (repo / "src" / "notes.csv").write_bytes(("id,text,flag\r\n" + "\r\n".join(rows) + "\r\n").encode("utf-8"))
+
+    cfg = make_config(whitelist_directories=["src/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    expected = (
+        "id,text,flag\r\n"
+        + "".join(r + "\r\n" for r in rows[:3])
+        + "... (6 rows omitted) ...,,\r\n"
+        + "".join(r + "\r\n" for r in rows[-3:])
+    )
+    assert (dest / "src" / "notes.csv").read_bytes() == expected.encode("utf-8")
+
+
+def test_sampling_large_json_array_is_streamed(tmp_path: Path, logger, monkeypatch):
+    import json
+
+    import src.repo_distiller as repo_distiller
+
+    monkeypatch.setattr(repo_distiller, "_JSON_STREAM_THRESHOLD_BYTES", 0)
+    monkeypatch.setattr(repo_distiller, "_SCAN_CHUNK_BYTES", 16)
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    items = [{"i": i, "v": i * 1.5} for i in range(25)]
+    write_text(repo / "src" / "data.json", json.dumps(items, indent=2))
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        sampling_exts={".json"},
+        blacklist_datetime_stamp_yyyymmdd=False,
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out = json.loads((dest / "src" / "data.json").read_text(encoding="utf-8"))
+    assert out["_total_items"] == 25
+    assert out["_omitted_items"] == 19
+    assert out["head"] == items[:3]
+    assert out["tail"] == items[-3:]
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_invalid_json_object_reported_at_any_size(tmp_path: Path, logger, monkeypatch, caplog, streamed):
+    import src.repo_distiller as repo_distiller
+
+    if streamed:
+        monkeypatch.setattr(repo_distiller, "_JSON_STREAM_THRESHOLD_BYTES", 0)
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "src" / "bad.json", '{"a": 1,')
+    write_text(repo / "src" / "good.json", '{"a": [1, 2, 3, 4, 5, 6, 7, 8]}')
+
+    cfg = make_config(whitelist_directories=["src/"], sampling_exts={".json"})
+    d = RepositoryDistiller(cfg, logger)
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert any(m.startswith("Invalid JSON in bad.json") for m in warnings)
+    assert not any("good.json" in m for m in warnings)
+    for name in ("bad.json", "good.json"):
+        assert (dest / "src" / name).read_bytes() == (repo / "src" / name).read_bytes()
+
+
+def test_json_dump_helper_round_trips_unicode_and_big_ints():
+    import json
+
+    from src.repo_distiller import _json_dumps_bytes
+
+    obj = {"name": "café", "big": 2 ** 70, "items": [1, 2.5, None, True]}
+    out = _json_dumps_bytes(obj)
+    assert isinstance(out, bytes)
+    assert "café" in out.decode("utf-8")
+    assert json.loads(out) == obj
+
+
+def test_json_dump_helper_keeps_nan_and_infinity():
+    import json
+    import math
+
+    from src.repo_distiller import _json_dumps_bytes
+
+    obj = {"head": [0, float("inf")], "tail": [{"x": float("-inf")}, float("nan")]}
+    out = json.loads(_json_dumps_bytes(obj))
+    assert out["head"] == [0, float("inf")]
+    assert out["tail"][0] == {"x": float("-inf")}
+    assert math.isnan(out["tail"][1])
+
+
+def test_json_sampling_keeps_non_finite_numbers(tmp_path: Path, logger):
+    import json
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    write_text(repo / "src" / "data.json", "[Infinity, 1, 2, 3, 4, 5, 6, -Infinity, 1e400]")
+
+    cfg = make_config(whitelist_directories=["src/"], sampling_exts={".json"})
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out = json.loads((dest / "src" / "data.json").read_text(encoding="utf-8"))
+    assert out["head"] == [float("inf"), 1, 2]
+    assert out["tail"] == [6, float("-inf"), float("inf")]
+
+
+def test_json_sampling_falls_back_to_stdlib_when_orjson_rejects(tmp_path: Path, logger, monkeypatch):
+    import json
+    import types
+
+    import src.repo_distiller as repo_distiller
+
+    def loads(data):
+        raise ValueError("rejected")
+
+    def dumps(obj, option=None):
+        raise TypeError("rejected")
+
+    monkeypatch.setattr(repo_distiller, "orjson", types.SimpleNamespace(loads=loads, dumps=dumps, OPT_INDENT_2=0))
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    items = [{"i": i, "big": 2 ** 70} for i in range(10)]
+    write_text(repo / "src" / "data.json", json.dumps(items))
+
+    cfg = make_config(whitelist_directories=["src/"], sampling_exts={".json"})
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out = json.loads((dest / "src" / "data.json").read_text(encoding="utf-8"))
+    assert out["_total_items"] == 10
+    assert out["head"] == items[:3]
+    assert out["tail"] == items[-3:]
+
+
+def test_json_sampling_keeps_wide_integers_exact_with_real_orjson(tmp_path: Path, logger):
+    import json
+
+    pytest.importorskip("orjson")
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    items = [2 ** 70 + i for i in range(10)]
+    write_text(repo / "src" / "data.json", json.dumps(items))
+
+    cfg = make_config(whitelist_directories=["src/"], sampling_exts={".json"})
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out = json.loads((dest / "src" / "data.json").read_text(encoding="utf-8"))
+    assert out["head"] == items[:3]
+    assert out["tail"] == items[-3:]
+    assert all(isinstance(v, int) for v in out["head"] + out["tail"])
+
+
+def test_tier2_fused_patterns_report_first_listed_match(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    f = repo / "src" / "step1_v2.py"
+    write_text(f, "pass")
+    g = repo / "src" / "main.py"
+    write_text(g, "pass")
+
+    cfg = make_config(
+        whitelist_directories=["src/"],
+        blacklist_patterns=[re.compile(r"_v\d{1,2}\.py$"), re.compile(r"^step\d{1,2}")],
+    )
+    d = RepositoryDistiller(cfg, logger)
+
+    action, reason = d.determine_action(f, repo)
+    assert action == FilterAction.SKIP
+    assert reason == r"tier2_blacklist_pattern:_v\d{1,2}\.py$"
+
+    action, reason = d.determine_action(g, repo)
+    assert action == FilterAction.COPY
+
+
+@pytest.mark.parametrize(
+    "copy_path", ["default", "sendfile", "userspace", "copy_file_range_fails", "fadvise_fails"]
+)
+def test_copied_file_preserves_content_and_mtime(tmp_path: Path, logger, monkeypatch, copy_path):
+    import os
+
+    import src.repo_distiller as repo_distiller
+
+    if copy_path in ("sendfile", "userspace"):
+        monkeypatch.setattr(repo_distiller, "_HAS_COPY_FILE_RANGE", False)
+    if copy_path == "userspace":
+        monkeypatch.setattr(repo_distiller, "_HAS_SENDFILE", False)
+    if copy_path == "copy_file_range_fails":
+        def unsupported(*args):
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr(repo_distiller, "_HAS_COPY_FILE_RANGE", True)
+        monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    if copy_path == "fadvise_fails":
+        def no_advice(*args):
+            raise OSError(29, "Illegal seek")
+
+        monkeypatch.setattr(repo_distiller, "_HAS_FADVISE", True)
+        monkeypatch.setattr(os, "posix_fadvise", no_advice, raising=False)
+        monkeypatch.setattr(os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    dest = tmp_path / "dest"
+
+    src_file = repo / "src" / "big.txt"
+    write_bytes(src_file, size=300_000)
+    os.utime(src_file, (1_600_000_000, 1_600_000_000))
+
+    cfg = make_config(whitelist_directories=["src/"])
+    d = RepositoryDistiller(cfg, logger)
+
+    ok = d.distill(repo, dest, dry_run=False)
+    assert ok is True
+
+    out = dest / "src" / "big.txt"
+    assert out.read_bytes() == src_file.read_bytes()
+    assert int(out.stat().st_mtime) == 1_600_000_000
+
+
+def test_setup_logging_flush_writes_queued_file_records(tmp_path: Path):
+    from src.repo_distiller import setup_logging
+
+    log = setup_logging(tmp_path, verbose=True)
+    try:
+        log.debug("queued %s", "record")
+        for handler in log.handlers:
+            handler.flush()
+
+        (log_file,) = tmp_path.glob("log_*.txt")
+        assert "queued record" in log_file.read_text(encoding="utf-8")
+    finally:
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            handler.close()
+
+
+def test_setup_logging_writes_queued_records_at_interpreter_exit(tmp_path: Path):
+    import subprocess
+
+    script = (
+        "import sys; from pathlib import Path\n"
+        "from src.repo_distiller import setup_logging\n"
+        "log = setup_logging(Path(sys.argv[1]))\n"
+        "log.info('last line before exit')\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path)],
+        cwd=str(Path(__file__).resolve().parents[1]),
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+    (log_file,) = tmp_path.glob("log_*.txt")
+    assert "last line before exit" in log_file.read_text(encoding="utf-8")
+
+
+def test_setup_logging_again_stops_previous_listener(tmp_path: Path):
+    import threading
+
+    from src.repo_distiller import setup_logging
+
+    before = threading.active_count()
+    log = setup_logging(tmp_path / "a")
+    first = [h for h in log.handlers if hasattr(h, "listener")]
+    log = setup_logging(tmp_path / "b")
+    try:
+        assert first and all(h not in log.handlers for h in first)
+        assert threading.active_count() == before + 1
+    finally:
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            handler.close()
+    assert threading.active_count() == before
+
+
+@pytest.mark.parametrize(
+    "rel_dir, expected",
+    [
+        ("build", True),
+        ("build/lib/pkg", True),
+        ("buildx", False),
+        ("docs", False),
+        ("docs/api/v1", True),
+        ("docs/api-v1", False),
+    ],
+)
+def test_blacklisted_dir_subtree_checks_each_ancestor(logger, rel_dir: str, expected: bool):
+    cfg = make_config(blacklist_directories=["build/", "./docs/api", "*/cache"])
+    d = RepositoryDistiller(cfg, logger)
+    assert d._is_blacklisted_dir_subtree(rel_dir) is expected
+
+
+def test_whitelist_directory_matches_whole_path_components(tmp_path: Path, logger):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    inside = repo / "src" / "app" / "main.py"
+    lookalike = repo / "srcutil" / "app" / "main.py"
+    write_text(inside, "x = 1\n")
+    write_text(lookalike, "x = 1\n")
+
+    cfg = make_config(whitelist_directories=["src/", "lib/core"])
+    d = RepositoryDistiller(cfg, logger)
+
+    assert d.determine_action(inside, repo) == (FilterAction.COPY, "tier4_copied")
+    assert d.determine_action(lookalike, repo) == (FilterAction.SKIP, "tier3_not_in_whitelist_scope")
+    assert d._is_outside_whitelist_scope("srcutil") is True
+    assert d._is_outside_whitelist_scope("lib") is False
+    assert d._is_outside_whitelist_scope("lib/core2") is True
+    assert d._is_outside_whitelist_scope("lib/core/x") is False
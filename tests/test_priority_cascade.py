@@ -7,8 +7,8 @@ import pytest
 from src.repo_distiller import DistillerConfig, RepositoryDistiller, FilterAction
 
 
-@pytest.fixture()
-def logger(tmp_path):
+@pytest.fixture(scope="session")
+def logger():
     # Quiet logger for tests
     log = logging.getLogger("repo_distiller_test")
     log.setLevel(logging.DEBUG)